@@ -9,111 +9,332 @@ import os
 from pathlib import Path
 from datetime import datetime
 import json
-import sys
 import time
+import logging
+import asyncio
+import functools
+import inspect
+import mmap
+import codecs
+import fnmatch
+import re
+import stat
+import errno
+import shutil
+import tempfile
+import threading
+import weakref
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from dataclasses import dataclass
 
 # Initialize the MCP server
 mcp = FastMCP("void-sandboxed-filesystem")
 
+# Logs go to stderr via the handler FastMCP installs, never the stdio transport
+log = logging.getLogger('void_mcp')
+# Verbose per-call logging, off unless VOID_MCP_DEBUG=1
+DEBUG = os.environ.get('VOID_MCP_DEBUG') == '1'
+log.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+
+# search_in_files stops scanning once this many matches are found
+MAX_SEARCH_RESULTS = 50
+# File scans are I/O-bound, so use more threads than cores
+SEARCH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
 # ============================================================================
 # SECURITY CONFIGURATION
 # ============================================================================
 
+# Built-in rules, shared and immutable; mcp_config.json can only add to them
+DEFAULT_BLOCKED_PATTERNS = (
+    '.git',
+    '.env',
+    '.ssh',
+    'node_modules',
+    '__pycache__',
+    '.venv',
+    'venv',
+    '*.key',
+    '*.pem',
+    '*.p12',
+    'id_rsa',
+    'id_ed25519'
+)
+DEFAULT_ALLOWED_EXTENSIONS = (
+    '.py', '.js', '.ts', '.jsx', '.tsx',
+    '.java', '.c', '.cpp', '.h', '.hpp',
+    '.go', '.rs', '.rb', '.php',
+    '.html', '.css', '.scss', '.json',
+    '.md', '.txt', '.yaml', '.yml',
+    '.toml', '.ini', '.cfg', '.xml'
+)
+
+
 class SecurityConfig:
     """Centralized security configuration"""
     
+    # Read on every tool call; slots give fixed-offset attribute access
+    __slots__ = (
+        'config_path', 'allowed_root', 'blocked_patterns',
+        'allowed_extensions', 'max_file_size',
+        '_check_cached', '_allowed_root_resolved', '_allowed_root_str',
+        '_allowed_root_prefix', '_root_spellings', '_blocked_suffixes', '_blocked_names',
+        '_allowed_exts', '_block_re', '_block_groups', '_config_render',
+        '_config_stamp',
+    )
+    
     def __init__(self, config_path: str = "mcp_config.json"):
         self.config_path = config_path
         self.allowed_root = None
-        self.blocked_patterns = [
-            '.git',
-            '.env',
-            '.ssh',
-            'node_modules',
-            '__pycache__',
-            '.venv',
-            'venv',
-            '*.key',
-            '*.pem',
-            '*.p12',
-            'id_rsa',
-            'id_ed25519'
-        ]
-        self.allowed_extensions = [
-            '.py', '.js', '.ts', '.jsx', '.tsx',
-            '.java', '.c', '.cpp', '.h', '.hpp',
-            '.go', '.rs', '.rb', '.php',
-            '.html', '.css', '.scss', '.json',
-            '.md', '.txt', '.yaml', '.yml',
-            '.toml', '.ini', '.cfg', '.xml'
-        ]
+        self.blocked_patterns = DEFAULT_BLOCKED_PATTERNS
+        self.allowed_extensions = DEFAULT_ALLOWED_EXTENSIONS
         self.max_file_size = 10 * 1024 * 1024  # 10MB
+        self._config_stamp = False  # never matches, so the first load always runs
+        # Per-instance memo of path -> (abs_path, allowed, reason)
+        self._check_cached = functools.lru_cache(maxsize=4096)(self._resolve_and_check)
         self.load_config()
     
-    def load_config(self):
-        """Load configuration from file if exists"""
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-                    self.allowed_root = config.get('allowed_root')
-                    self.blocked_patterns.extend(config.get('additional_blocked', []))
-                    self.allowed_extensions.extend(config.get('additional_extensions', []))
-            except Exception as e:
-                print(f"Warning: Could not load config: {e}")
-        
-        # Default to current working directory if not set
-        if not self.allowed_root:
-            self.allowed_root = os.getcwd()
+    def _read_stamp(self) -> tuple[int, int] | None:
+        """(mtime_ns, size) of the config file, or None if it doesn't exist"""
+        try:
+            st = os.stat(self.config_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+    
+    def _parse_config(self, stamp) -> tuple[str | None, tuple, tuple]:
+        """
+        Read the config file into (allowed_root, blocked_patterns, allowed_extensions)
+        Raises on a malformed file; a missing file (stamp None) gives the defaults
+        """
+        if stamp is None:
+            return None, DEFAULT_BLOCKED_PATTERNS, DEFAULT_ALLOWED_EXTENSIONS
+        with open(self.config_path, 'r') as f:
+            config = json.load(f)
+        # Rebuilt from the defaults, so reloading doesn't duplicate entries
+        return (
+            config.get('allowed_root'),
+            DEFAULT_BLOCKED_PATTERNS + tuple(config.get('additional_blocked', [])),
+            DEFAULT_ALLOWED_EXTENSIONS + tuple(config.get('additional_extensions', [])),
+        )
+    
+    def load_config(self, force: bool = False):
+        """Load configuration from file if exists (skipped if the file is unchanged)"""
+        stamp = self._read_stamp()
+        if stamp == self._config_stamp and not force:
+            return
+        
+        # Parse into locals first, so a malformed or half-saved file can't
+        # drop the rules already in force
+        try:
+            allowed_root, blocked, extensions = self._parse_config(stamp)
+        except Exception as e:
+            if self._config_stamp is not False:
+                log.warning(f"Could not reload config, keeping current rules: {e}")
+                return
+            log.warning(f"Could not load config: {e}")
+            allowed_root, blocked, extensions = None, DEFAULT_BLOCKED_PATTERNS, DEFAULT_ALLOWED_EXTENSIONS
+        
+        self._config_stamp = stamp
+        self.blocked_patterns = blocked
+        self.allowed_extensions = extensions
+        # Default to current working directory if not set (also when the
+        # config file has been removed since the last load)
+        self.allowed_root = allowed_root or os.getcwd()
+
+        # The root never changes after load, so resolve it once
+        self._allowed_root_resolved = Path(self.allowed_root).resolve()
+        self._allowed_root_str = str(self._allowed_root_resolved)
+        # Prefix that every path strictly inside the root starts with
+        self._allowed_root_prefix = os.path.join(self._allowed_root_str, '')
+        # The root as resolved and as configured (they differ if it sits behind
+        # a symlink), for the lexical pass in _resolve_and_check()
+        configured = os.path.abspath(self.allowed_root)
+        self._root_spellings = tuple(
+            (root, os.path.join(root, ''))
+            for root in dict.fromkeys((self._allowed_root_str, configured))
+        )
+        self._compile_rules()
+        self._check_cached.cache_clear()
+        self._config_render = None
+    
+    def _compile_rules(self):
+        """Precompile patterns so checks are lookups, not a per-call loop"""
+        # Lowercase suffixes for a single name.lower().endswith(tuple) test
+        self._blocked_suffixes = tuple(
+            p[1:].lower() for p in self.blocked_patterns if p.startswith('*.')
+        )
+        self._blocked_names = frozenset(
+            p for p in self.blocked_patterns if not p.startswith('*.')
+        )
+        self._allowed_exts = frozenset(e.lower() for e in self.allowed_extensions)
+        
+        # One alternation over the whole path string; group N is blocked_patterns[N-1]
+        sep = re.escape(os.sep)
+        alternatives = []
+        for p in self.blocked_patterns:
+            if p.startswith('*.'):
+                alternatives.append(f"(?i:({re.escape(p[1:])}))$")
+            else:
+                alternatives.append(f"(?:^|{sep})({re.escape(p)})(?:{sep}|$)")
+        self._block_re = re.compile('|'.join(alternatives) or r'(?!)')
+        self._block_groups = tuple(self.blocked_patterns)
+    
+    def check_path(self, path: str) -> tuple[Path | None, bool, str]:
+        """
+        Resolve a path and check it against the security rules
+        The path rules are memoized per raw path string until invalidate() is
+        called, but allowed paths are re-resolved and their file type
+        re-checked on every call
+        Returns: (abs_path, is_allowed, reason)
+        """
+        verdict = self._check_cached(path)
+        if not verdict[1]:
+            return verdict
+        
+        # An allowed verdict only holds while the path resolves to the same
+        # place: a symlink swapped in later (git checkout, an editor, another
+        # process) must not inherit it
+        try:
+            current = Path(path).resolve()
+        except Exception as e:
+            return None, False, f"Path validation error: {str(e)}"
+        if current != verdict[0]:
+            self._check_cached.cache_clear()
+            verdict = self._check_cached(path)
+            if not verdict[1]:
+                return verdict
+        
+        # Never memoized: a directory may be replaced by a file at any time
+        try:
+            reason = self._extension_reason(verdict[0])
+        except Exception as e:
+            return None, False, f"Path validation error: {str(e)}"
+        if reason:
+            return verdict[0], False, reason
+        return verdict
     
     def is_path_allowed(self, path: str) -> tuple[bool, str]:
         """
         Check if a path is allowed based on security rules
         Returns: (is_allowed, reason)
         """
+        _, allowed, reason = self.check_path(path)
+        return allowed, reason
+    
+    def relative_path(self, abs_path: Path) -> str:
+        """Format a resolved path inside the root relative to it, for messages"""
+        abs_str = str(abs_path)
+        if abs_str == self._allowed_root_str:
+            return "."
+        return abs_str[len(self._allowed_root_prefix):]
+    
+    def invalidate(self):
+        """Forget memoized verdicts (call after creating, moving or deleting paths)"""
+        self._check_cached.cache_clear()
+    
+    def _blocked_reason(self, path_str: str) -> str | None:
+        """Blocked-pattern check on a path string"""
+        match = self._block_re.search(path_str)
+        if match:
+            pattern = self._block_groups[match.lastindex - 1]
+            if pattern.startswith('*.'):
+                return f"Blocked file extension: {pattern}"
+            return f"Blocked pattern: {pattern}"
+        return None
+    
+    def _deny_reason(self, path_str: str) -> str | None:
+        """Containment and blocked-pattern checks on a resolved absolute path string"""
+        # Plain prefix test, no exceptions
+        if path_str != self._allowed_root_str and not path_str.startswith(self._allowed_root_prefix):
+            return f"Path outside allowed directory: {self._allowed_root_str}"
+        return self._blocked_reason(path_str)
+    
+    def _lexical_deny_reason(self, lexical: str) -> str | None:
+        """
+        Syscall-free pre-check on an unresolved absolute path
+        Only denies blocked names below the root; a path that looks outside
+        may still reach the root through a symlink, so resolve() decides that
+        """
+        for root, prefix in self._root_spellings:
+            if lexical == root or lexical.startswith(prefix):
+                return self._blocked_reason(lexical[len(root):])
+        return None
+    
+    def _resolve_and_check(self, path: str) -> tuple[Path | None, bool, str]:
+        """Uncached path rules behind check_path() (everything but the file-type dependent whitelist)"""
         try:
-            # Resolve to absolute path
-            abs_path = Path(path).resolve()
-            allowed_root = Path(self.allowed_root).resolve()
-            
-            # Check if path is within allowed root
-            try:
-                abs_path.relative_to(allowed_root)
-            except ValueError:
-                return False, f"Path outside allowed directory: {allowed_root}"
-            
-            # Check for blocked patterns
-            path_str = str(abs_path)
-            for pattern in self.blocked_patterns:
-                if pattern.startswith('*.'):
-                    # Extension check
-                    if path_str.endswith(pattern[1:]):
-                        return False, f"Blocked file extension: {pattern}"
-                else:
-                    # Directory/file name check
-                    if pattern in path_str.split(os.sep):
-                        return False, f"Blocked pattern: {pattern}"
+            # Lexical pass first: abspath is string work only, so blocked
+            # paths under the root are denied without any syscalls
+            lexical = os.path.abspath(path)
+            reason = self._lexical_deny_reason(lexical)
+            if reason:
+                return Path(lexical), False, reason
             
-            # For file operations, check extension whitelist
-            if abs_path.is_file() or not abs_path.exists():
-                ext = abs_path.suffix.lower()
-                if ext and ext not in self.allowed_extensions:
-                    return False, f"File extension not allowed: {ext}"
+            # Resolve symlinks and check again, so links can't escape the root
+            # or reach blocked files under an innocent name. The lexical pass
+            # alone can't allow a path: abspath collapses 'link/..' textually,
+            # while the kernel follows the link first
+            abs_path = Path(path).resolve()
+            reason = self._deny_reason(str(abs_path))
+            if reason:
+                return abs_path, False, reason
             
-            return True, "OK"
+            return abs_path, True, "OK"
             
         except Exception as e:
-            return False, f"Path validation error: {str(e)}"
+            return None, False, f"Path validation error: {str(e)}"
     
-    def check_file_size(self, path: str) -> tuple[bool, str]:
-        """Check if file size is within limits"""
+    def _extension_reason(self, abs_path: Path) -> str | None:
+        """Extension whitelist, which applies to regular files and paths that don't exist yet"""
+        ext = abs_path.suffix.lower()
+        if not ext or ext in self._allowed_exts:
+            return None
         try:
-            size = os.path.getsize(path)
-            if size > self.max_file_size:
-                return False, f"File too large: {size} bytes (max: {self.max_file_size})"
-            return True, "OK"
-        except Exception as e:
-            return False, f"Size check error: {str(e)}"
+            # One stat answers both "is a file" and "does not exist"
+            if not stat.S_ISREG(os.stat(abs_path).st_mode):
+                return None
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        return f"File extension not allowed: {ext}"
+    
+    def _fast_check(self, parts: tuple[str, ...], suffix: str) -> bool:
+        """
+        Cheap re-check for paths found under an already validated directory
+        Only blocked names and extensions need checking, as containment holds
+        """
+        suffix = suffix.lower()
+        return (
+            self._blocked_names.isdisjoint(parts)
+            # Whole name, so dotfiles like '.pem' (no suffix) are caught too
+            and not parts[-1].lower().endswith(self._blocked_suffixes)
+            and (not suffix or suffix in self._allowed_exts)
+        )
+    
+    def describe(self) -> str:
+        """Human-readable summary for the security://config resource, rendered once per load"""
+        if self._config_render is None:
+            self._config_render = f"""
+Security Configuration:
+======================
+Allowed Root: {self.allowed_root}
+Max File Size: {self.max_file_size / (1024*1024):.1f} MB
+
+Blocked Patterns: {', '.join(self.blocked_patterns[:10])}
+{f"... and {len(self.blocked_patterns) - 10} more" if len(self.blocked_patterns) > 10 else ""}
+
+Allowed Extensions: {', '.join(self.allowed_extensions[:20])}
+{f"... and {len(self.allowed_extensions) - 20} more" if len(self.allowed_extensions) > 20 else ""}
+    """
+        return self._config_render
+    
+    def check_file_size(self, size: int) -> tuple[bool, str]:
+        """Check if a file size (from a stat the caller already made) is within limits"""
+        if size > self.max_file_size:
+            return False, f"File too large: {size} bytes (max: {self.max_file_size})"
+        return True, "OK"
 
 
 # Initialize security config
@@ -122,6 +343,249 @@ _script_dir = Path(__file__).parent
 _config_path = _script_dir / "mcp_config.json"
 security = SecurityConfig(str(_config_path))
 
+# ============================================================================
+# FILE I/O HELPERS
+# ============================================================================
+
+# Linux-only readahead hint for mapped files; None where unsupported
+_MADV_WILLNEED = getattr(mmap, 'MADV_WILLNEED', None)
+# Below this size a single read() is cheaper than setting up a mapping
+_MMAP_MIN_SIZE = 256 * 1024
+# Window size when streaming large files through search
+_SCAN_CHUNK = 1024 * 1024
+
+
+def _normalize_newlines(data: bytes) -> bytes:
+    """Translate CRLF/CR to LF, as text-mode reads always did"""
+    return data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+
+def _read_text(abs_path: Path) -> str:
+    """
+    Read a UTF-8 file in binary mode, translating newlines like text mode
+    Large files are decoded straight out of a read-only mapping, so the
+    content is never held as an intermediate bytes copy
+    """
+    with open(abs_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return ""
+        if size < _MMAP_MIN_SIZE:
+            content = f.read().decode('utf-8')
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = str(mm, 'utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _check_utf8(buf) -> None:
+    """
+    Raise UnicodeDecodeError unless buf is valid UTF-8
+    Decodes in _SCAN_CHUNK slices and discards the text, so validating never
+    holds a decoded copy of the whole file
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for start in range(0, len(buf), _SCAN_CHUNK):
+        decoder.decode(buf[start:start + _SCAN_CHUNK])
+    decoder.decode(b'', final=True)
+
+
+def _splice(buf, old: bytes, new: bytes, replace_all: bool) -> tuple[bytearray | None, int]:
+    """Body of _replace_in_file() for a buffer holding the whole file"""
+    # Same check read_file makes, so edits never splice UTF-8 text into a
+    # file in another encoding
+    _check_utf8(buf)
+    if buf.find(b'\r') != -1:
+        buf = _normalize_newlines(buf[:])
+    
+    offsets = []
+    pos = buf.find(old)
+    while pos != -1:
+        offsets.append(pos)
+        if not replace_all and len(offsets) > 1:
+            # Ambiguous: only the error message needs the exact count
+            return None, buf[:].count(old)
+        pos = buf.find(old, pos + len(old))
+    if not offsets:
+        return None, 0
+    
+    # Allocate the result once and copy slices in without temporaries
+    out = bytearray(len(buf) + len(offsets) * (len(new) - len(old)))
+    with memoryview(buf) as view:
+        src = dst = 0
+        for pos in offsets:
+            n = pos - src
+            out[dst:dst + n] = view[src:pos]
+            dst += n
+            out[dst:dst + len(new)] = new
+            dst += len(new)
+            src = pos + len(old)
+        out[dst:] = view[src:]
+    return out, len(offsets)
+
+
+def _replace_in_file(abs_path: Path, old: bytes, new: bytes, replace_all: bool) -> tuple[bytearray | None, int]:
+    """
+    Find every occurrence of old and splice in new, in one pass over the bytes
+    Returns: (new_content, occurrences) - new_content is None when old is
+    missing, or appears more than once without replace_all
+    Raises UnicodeDecodeError if the file is not UTF-8
+    """
+    with open(abs_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return None, 0
+        if size < _MMAP_MIN_SIZE:
+            return _splice(f.read(), old, new, replace_all)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _splice(mm, old, new, replace_all)
+
+
+def _write_bytes(abs_path: Path, data: bytes | bytearray, atomic: bool = True) -> bool:
+    """
+    Write data to abs_path in binary mode
+    With atomic=True an existing file is replaced through a temp file in the
+    same directory and os.replace(), so it is never left half-written
+    Returns: True if an existing file was replaced
+    """
+    try:
+        st = os.stat(abs_path)
+    except FileNotFoundError:
+        st = None
+    
+    if st is None or not atomic:
+        with open(abs_path, 'wb') as f:
+            f.write(data)
+        return st is not None
+    
+    # os.replace() only needs write access to the directory, so probe the file
+    # itself: a read-only file must fail here with the same PermissionError a
+    # plain open(path, 'w') raises
+    os.close(os.open(abs_path, os.O_WRONLY))
+    
+    fd, tmp = tempfile.mkstemp(dir=abs_path.parent, prefix=f".{abs_path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates 0600; keep the original file's permissions
+        os.chmod(tmp, stat.S_IMODE(st.st_mode))
+        os.replace(tmp, abs_path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+# One lock per resolved path, dropped automatically once no caller holds it
+_path_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_path_locks_guard = threading.Lock()
+
+
+@contextlib.contextmanager
+def _locked(*paths: Path):
+    """
+    Serialize mutating tools on the paths they touch
+    Tools run in worker threads (see _in_thread), so without this two
+    concurrent edit_file calls on one file would both read the old content
+    and the second write would drop the first edit. Locks are taken in
+    sorted order so multi-path tools (move_file) can't deadlock.
+    """
+    with _path_locks_guard:
+        locks = [
+            _path_locks.setdefault(key, threading.Lock())
+            for key in sorted({str(p) for p in paths})
+        ]
+    for lock in locks:
+        lock.acquire()
+    try:
+        yield
+    finally:
+        for lock in reversed(locks):
+            lock.release()
+
+
+def _in_thread(fn):
+    """
+    Expose a blocking tool as a coroutine that runs it via asyncio.to_thread()
+    FastMCP awaits async tools, so slow file I/O no longer stalls the event
+    loop and concurrent requests can make progress
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return wrapper
+
+
+@dataclass(slots=True)
+class FileCtx:
+    """A validated, existing regular file handed to a tool body"""
+    path: str  # as given by the caller, for messages
+    abs_path: Path
+    st: os.stat_result
+
+
+def validated_file_op(param: str = "path", check_size: bool = True,
+                      not_file: str = "Not a file", invalidates: bool = False,
+                      locked: bool = False):
+    """
+    Shared preamble for tools that act on one existing file
+    Runs the security check and a single os.stat() (existence, type and size),
+    then calls the tool body with a FileCtx in place of the `param` argument.
+    With locked=True the stat and the body run under the path's lock.
+    The public signature keeps `param: str`, so the tool schema is unchanged.
+    """
+    def decorator(fn):
+        sig = inspect.signature(fn)
+        params = list(sig.parameters.values())
+        params[0] = inspect.Parameter(param, inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=str)
+        public_sig = sig.replace(parameters=params)
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            arguments = public_sig.bind(*args, **kwargs).arguments
+            path = arguments.pop(param)
+            abs_path, allowed, reason = security.check_path(path)
+            if DEBUG:
+                log.debug("%s path=%r allowed=%s reason=%s root=%s",
+                          fn.__name__, path, allowed, reason, security.allowed_root)
+            if not allowed:
+                return f"Access denied: {reason}"
+            
+            with _locked(abs_path) if locked else contextlib.nullcontext():
+                return run(path, abs_path, arguments)
+        
+        def run(path, abs_path, arguments):
+            try:
+                st = os.stat(abs_path)
+            except FileNotFoundError:
+                return f"File not found: {path}"
+            except OSError as e:
+                return f"Error accessing file: {str(e)}"
+            
+            if not stat.S_ISREG(st.st_mode):
+                return f"{not_file}: {path}"
+            
+            if check_size:
+                size_ok, size_reason = security.check_file_size(st.st_size)
+                if not size_ok:
+                    return size_reason
+            
+            try:
+                return fn(FileCtx(path, abs_path, st), **arguments)
+            finally:
+                if invalidates:
+                    security.invalidate()
+        
+        wrapper.__signature__ = public_sig
+        return wrapper
+    return decorator
+
+
 # ============================================================================
 # SAFE FILESYSTEM OPERATIONS
 # ============================================================================
@@ -134,39 +598,19 @@ security = SecurityConfig(str(_config_path))
         idempotentHint=True
     )
 )
-def read_file(path: str) -> str:
+@_in_thread
+@validated_file_op()
+def read_file(ctx: FileCtx) -> str:
     """Read contents of a file (with security checks)
 
     Args:
         path: Path to the file to read
     """
-    print(f"[DEBUG read_file] Received path: {path!r}", flush=True)
-    allowed, reason = security.is_path_allowed(path)
-    print(f"[DEBUG read_file] Allowed: {allowed}, Reason: {reason}", flush=True)
-    print(f"[DEBUG read_file] Allowed root: {security.allowed_root}", flush=True)
-    if not allowed:
-        return f"Access denied: {reason}"
-    
     try:
-        abs_path = Path(path).resolve()
-        
-        if not abs_path.exists():
-            return f"File not found: {path}"
-        
-        if not abs_path.is_file():
-            return f"Not a file: {path}"
-        
-        size_ok, size_reason = security.check_file_size(str(abs_path))
-        if not size_ok:
-            return size_reason
-        
-        with open(abs_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return content
+        return _read_text(ctx.abs_path)
         
     except UnicodeDecodeError:
-        return f"File appears to be binary or uses unsupported encoding: {path}"
+        return f"File appears to be binary or uses unsupported encoding: {ctx.path}"
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
@@ -180,6 +624,7 @@ def read_file(path: str) -> str:
         idempotentHint=True
     )
 )
+@_in_thread
 def write_file(path: str, content: str) -> str:
     """Write content to a file (with security checks)
 
@@ -187,24 +632,24 @@ def write_file(path: str, content: str) -> str:
         path: Path to the file
         content: Content to write
     """
-    allowed, reason = security.is_path_allowed(path)
+    abs_path, allowed, reason = security.check_path(path)
     if not allowed:
         return f"Access denied: {reason}"
     
     try:
-        abs_path = Path(path).resolve()
-        
         # Create parent directory if it doesn't exist
         abs_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Check if we're overwriting an existing file
-        existed = abs_path.exists()
+        # Encode once and write in binary mode; reports whether a file was replaced
+        data = content.encode('utf-8')
+        with _locked(abs_path):
+            existed = _write_bytes(abs_path, data)
         
-        with open(abs_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        if not existed:
+            security.invalidate()
         
         action = "Updated" if existed else "Created"
-        rel_path = abs_path.relative_to(security.allowed_root)
+        rel_path = security.relative_path(abs_path)
         
         return f"{action} file: {rel_path}"
         
@@ -221,6 +666,7 @@ def write_file(path: str, content: str) -> str:
         idempotentHint=False
     )
 )
+@_in_thread
 def create_file(path: str, content: str = "") -> str:
     """Create a new file (fails if file exists)
 
@@ -228,22 +674,24 @@ def create_file(path: str, content: str = "") -> str:
         path: Path to the file
         content: Initial content (optional)
     """
-    allowed, reason = security.is_path_allowed(path)
+    abs_path, allowed, reason = security.check_path(path)
     if not allowed:
         return f"Access denied: {reason}"
     
     try:
-        abs_path = Path(path).resolve()
-        
-        if abs_path.exists():
-            return f"File already exists: {path}. Use write_file to update it."
-        
         abs_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(abs_path, 'w', encoding='utf-8') as f:
+        # O_EXCL creates or fails in one syscall, so concurrent calls can't
+        # both pass an existence check and overwrite each other
+        try:
+            fd = os.open(abs_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            return f"File already exists: {path}. Use write_file to update it."
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
             f.write(content)
+        security.invalidate()
         
-        rel_path = abs_path.relative_to(security.allowed_root)
+        rel_path = security.relative_path(abs_path)
         return f"Created file: {rel_path}"
         
     except Exception as e:
@@ -259,28 +707,19 @@ def create_file(path: str, content: str = "") -> str:
         idempotentHint=False
     )
 )
-def delete_file(path: str) -> str:
+@_in_thread
+@validated_file_op(check_size=False, not_file="Not a file (use delete_directory for directories)",
+                   invalidates=True, locked=True)
+def delete_file(ctx: FileCtx) -> str:
     """Delete a file (requires confirmation via explicit call)
 
     Args:
         path: Path to the file to delete
     """
-    allowed, reason = security.is_path_allowed(path)
-    if not allowed:
-        return f"Access denied: {reason}"
-    
     try:
-        abs_path = Path(path).resolve()
+        ctx.abs_path.unlink()
         
-        if not abs_path.exists():
-            return f"File not found: {path}"
-        
-        if not abs_path.is_file():
-            return f"Not a file (use delete_directory for directories): {path}"
-        
-        abs_path.unlink()
-        
-        return f"Deleted file: {path}"
+        return f"Deleted file: {ctx.path}"
         
     except Exception as e:
         return f"Error deleting file: {str(e)}"
@@ -295,7 +734,9 @@ def delete_file(path: str) -> str:
         idempotentHint=True
     )
 )
-def edit_file(file_path: str, old_string: str, new_string: str, replace_all: bool = False) -> str:
+@_in_thread
+@validated_file_op(param="file_path", locked=True)
+def edit_file(ctx: FileCtx, old_string: str, new_string: str, replace_all: bool = False) -> str:
     """Edit a file by replacing exact text matches.
 
     Args:
@@ -307,63 +748,40 @@ def edit_file(file_path: str, old_string: str, new_string: str, replace_all: boo
     Returns:
         Success message or error description
     """
-    # Security validation
-    allowed, reason = security.is_path_allowed(file_path)
-    if not allowed:
-        return f"Access denied: {reason}"
+    file_path, abs_path = ctx.path, ctx.abs_path
 
-    try:
-        abs_path = Path(file_path).resolve()
+    if not old_string:
+        return "Error: old_string must not be empty"
 
-        # File existence check
-        if not abs_path.exists():
-            return f"File not found: {file_path}"
-
-        if not abs_path.is_file():
-            return f"Not a file: {file_path}"
-
-        # Size check
-        size_ok, size_reason = security.check_file_size(str(abs_path))
-        if not size_ok:
-            return size_reason
-
-        # Read file
-        try:
-            with open(abs_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            return f"File appears to be binary or uses unsupported encoding: {file_path}"
+    try:
+        # Find and splice in one pass over the raw bytes. UTF-8 is
+        # self-synchronizing, so a byte match is always a character match.
+        new_content, count = _replace_in_file(
+            abs_path, old_string.encode('utf-8'), new_string.encode('utf-8'), replace_all
+        )
 
         # Validate old_string exists
-        if old_string not in content:
+        if count == 0:
             return f"Error: old_string not found in {file_path}"
 
         # Check uniqueness (if not replace_all)
-        if not replace_all:
-            count = content.count(old_string)
-            if count > 1:
-                return (
-                    f"Error: old_string appears {count} times in {file_path}. "
-                    f"Use replace_all=True to replace all occurrences, or provide "
-                    f"more context to make old_string unique."
-                )
-
-        # Perform replacement
-        if replace_all:
-            new_content = content.replace(old_string, new_string)
-            replacements = content.count(old_string)
-        else:
-            new_content = content.replace(old_string, new_string, 1)
-            replacements = 1
+        if new_content is None:
+            return (
+                f"Error: old_string appears {count} times in {file_path}. "
+                f"Use replace_all=True to replace all occurrences, or provide "
+                f"more context to make old_string unique."
+            )
+        replacements = count
 
         # Write back
-        with open(abs_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        _write_bytes(abs_path, new_content)
 
         # Success message
-        rel_path = abs_path.relative_to(security.allowed_root)
+        rel_path = security.relative_path(abs_path)
         return f"Successfully replaced {replacements} occurrence(s) in {rel_path}"
 
+    except UnicodeDecodeError:
+        return f"File appears to be binary or uses unsupported encoding: {file_path}"
     except Exception as e:
         return f"Error editing file: {str(e)}"
 
@@ -376,46 +794,47 @@ def edit_file(file_path: str, old_string: str, new_string: str, replace_all: boo
         idempotentHint=True
     )
 )
+@_in_thread
 def list_directory(path: str = ".") -> str:
     """List contents of a directory
 
     Args:
         path: Directory path (default: current directory)
     """
-    allowed, reason = security.is_path_allowed(path)
+    abs_path, allowed, reason = security.check_path(path)
     if not allowed:
         return f"Access denied: {reason}"
     
     try:
-        abs_path = Path(path).resolve()
-        
-        if not abs_path.exists():
+        # One scandir pass: DirEntry caches the file type from the directory
+        # read, so only files (for their size) and symlinks need a stat()
+        dirs, files = [], []
+        try:
+            with os.scandir(abs_path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        dirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append((entry.name, entry.stat().st_size))
+        except FileNotFoundError:
             return f"Directory not found: {path}"
-        
-        if not abs_path.is_dir():
+        except NotADirectoryError:
             return f"Not a directory: {path}"
         
-        items = list(abs_path.iterdir())
-        files = [f for f in items if f.is_file()]
-        dirs = [d for d in items if d.is_dir()]
-        
-        result = f"Directory: {abs_path.relative_to(security.allowed_root)}\n\n"
+        parts = [f"Directory: {security.relative_path(abs_path)}\n\n"]
         
         if dirs:
-            result += "Directories:\n"
-            for d in sorted(dirs):
-                result += f"  {d.name}\n"
+            parts.append("Directories:\n")
+            parts.extend(f"  {name}\n" for name in sorted(dirs))
         
         if files:
-            result += "\nFiles:\n"
-            for f in sorted(files):
-                size = f.stat().st_size
-                result += f"  {f.name} ({size} bytes)\n"
+            parts.append("\nFiles:\n")
+            parts.extend(f"  {name} ({size} bytes)\n" for name, size in sorted(files))
         
         if not dirs and not files:
-            result += "(empty directory)\n"
+            parts.append("(empty directory)\n")
         
-        return result
+        return "".join(parts)
         
     except Exception as e:
         return f"Error listing directory: {str(e)}"
@@ -430,25 +849,25 @@ def list_directory(path: str = ".") -> str:
         idempotentHint=True
     )
 )
+@_in_thread
 def create_directory(path: str) -> str:
     """Create a new directory
 
     Args:
         path: Path of directory to create
     """
-    allowed, reason = security.is_path_allowed(path)
+    abs_path, allowed, reason = security.check_path(path)
     if not allowed:
         return f"Access denied: {reason}"
     
     try:
-        abs_path = Path(path).resolve()
-        
-        if abs_path.exists():
+        try:
+            abs_path.mkdir(parents=True, exist_ok=False)
+        except FileExistsError:
             return f"Directory already exists: {path}"
+        security.invalidate()
         
-        abs_path.mkdir(parents=True, exist_ok=False)
-        
-        return f"Created directory: {abs_path.relative_to(security.allowed_root)}"
+        return f"Created directory: {security.relative_path(abs_path)}"
         
     except Exception as e:
         return f"Error creating directory: {str(e)}"
@@ -463,6 +882,7 @@ def create_directory(path: str) -> str:
         idempotentHint=False
     )
 )
+@_in_thread
 def move_file(source: str, destination: str) -> str:
     """Move or rename a file
 
@@ -470,26 +890,32 @@ def move_file(source: str, destination: str) -> str:
         source: Current file path
         destination: New file path
     """
-    src_allowed, src_reason = security.is_path_allowed(source)
+    src_path, src_allowed, src_reason = security.check_path(source)
     if not src_allowed:
         return f"Source access denied: {src_reason}"
     
-    dst_allowed, dst_reason = security.is_path_allowed(destination)
+    dst_path, dst_allowed, dst_reason = security.check_path(destination)
     if not dst_allowed:
         return f"Destination access denied: {dst_reason}"
     
     try:
-        src_path = Path(source).resolve()
-        dst_path = Path(destination).resolve()
-        
-        if not src_path.exists():
-            return f"Source file not found: {source}"
-        
-        if dst_path.exists():
-            return f"Destination already exists: {destination}"
-        
-        dst_path.parent.mkdir(parents=True, exist_ok=True)
-        src_path.rename(dst_path)
+        with _locked(src_path, dst_path):
+            if not src_path.exists():
+                return f"Source file not found: {source}"
+            
+            if dst_path.exists():
+                return f"Destination already exists: {destination}"
+            
+            dst_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(src_path, dst_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # Across filesystems (bind mounts, tmpfs): shutil copies in the
+                # kernel via copy_file_range/sendfile, then removes the source
+                shutil.move(src_path, dst_path)
+        security.invalidate()
         
         return f"Moved: {source} to {destination}"
         
@@ -497,6 +923,171 @@ def move_file(source: str, destination: str) -> str:
         return f"Error moving file: {str(e)}"
 
 
+def _scan_buffer(raw: bytes, needle: bytes | str, limit: int, hits: list, line_no: int) -> int:
+    """
+    Append (line_number, stripped_line) to hits for lines of raw containing
+    needle, stopping at limit hits; raw must start at a line boundary
+    A bytes needle is matched with ASCII case folding; a str needle (one with
+    non-ASCII characters, already casefolded) against decoded, casefolded lines
+    Returns: the line number at the end of raw, for scanning the next chunk
+    """
+    # Line numbers must agree with read_file, which reads CR and CRLF as LF
+    if b'\r' in raw:
+        raw = _normalize_newlines(raw)
+    if isinstance(needle, str):
+        return _scan_text_lines(raw.decode('utf-8', errors='replace'), needle, limit, hits, line_no)
+    # needle is already lowercase; if upper() leaves it unchanged it has no letters.
+    # Lowering the whole buffer and using find() beats re.IGNORECASE, which
+    # disables the regex engine's literal fast search (about 5x slower here)
+    haystack = raw.lower() if needle.upper() != needle else raw
+    size = len(haystack)
+    counted = 0
+    pos = haystack.find(needle)
+    while pos != -1 and pos < size:
+        line_no += haystack.count(b'\n', counted, pos)
+        start = haystack.rfind(b'\n', 0, pos) + 1
+        end = haystack.find(b'\n', pos)
+        if end == -1:
+            end = size
+        line = raw[start:end].decode('utf-8', errors='replace').strip()
+        hits.append((line_no, line))
+        if len(hits) >= limit:
+            break
+        # Resume on the next line so each line is reported once
+        counted = end
+        pos = haystack.find(needle, end + 1)
+    return line_no + haystack.count(b'\n', counted)
+
+
+def _scan_text_lines(text: str, needle: str, limit: int, hits: list, line_no: int) -> int:
+    """
+    Slow path of _scan_buffer() for non-ASCII needles: bytes.lower() only
+    folds ASCII, so each line is casefolded as text, as the original
+    line-by-line search did
+    """
+    lines = text.split('\n')
+    for i, line in enumerate(lines, line_no):
+        if needle in line.casefold():
+            hits.append((i, line.strip()))
+            if len(hits) >= limit:
+                break
+    return line_no + len(lines) - 1
+
+
+def _scan_file(file_path: str, needle: bytes | str, limit: int, max_size: int) -> list[tuple[int, str]]:
+    """Return (line_number, stripped_line) for up to limit lines containing needle
+
+    The raw bytes are lowercased (only if the needle has letters) and searched
+    with bytes.find() over whole buffers; only matching lines are decoded.
+    Non-ASCII needles (passed as str) take the slower decoded path instead.
+    Large files are streamed through the mapping in line-aligned chunks, so
+    memory use is bounded by _SCAN_CHUNK rather than the file size.
+    Files larger than max_size are skipped, as read_file would refuse them.
+    """
+    hits = []
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or size > max_size:
+            return hits
+        if size < _MMAP_MIN_SIZE:
+            _scan_buffer(f.read(), needle, limit, hits, 1)
+            return hits
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if _MADV_WILLNEED is not None:
+                # Ask the kernel to read the whole file ahead in one batch
+                mm.madvise(_MADV_WILLNEED)
+            start, line_no = 0, 1
+            while start < size and len(hits) < limit:
+                end = min(start + _SCAN_CHUNK, size)
+                if end < size:
+                    # Cut after the last line break (LF or CR) so no line
+                    # spans two chunks
+                    cut = max(mm.rfind(b'\n', start, end), mm.rfind(b'\r', start, end))
+                    if cut == -1:
+                        ahead = [i for i in (mm.find(b'\n', end), mm.find(b'\r', end)) if i != -1]
+                        cut = min(ahead, default=size - 1)
+                    if mm[cut:cut + 2] == b'\r\n':
+                        # Keep CRLF pairs together, or the LF would count twice
+                        cut += 1
+                    end = cut + 1
+                line_no = _scan_buffer(mm[start:end], needle, limit, hits, line_no)
+                start = end
+    return hits
+
+
+def _match_components(pattern: list, parts: list[str]) -> bool:
+    """
+    Match path components against pattern components, where each pattern
+    item is a compiled match function or None for '**' (zero or more
+    components). Runs the pattern as a small NFA, so it is linear in parts.
+    """
+    def skip_globstars(states):
+        # '**' may match nothing, so each state also stands for the ones after it
+        out = set()
+        for i in states:
+            out.add(i)
+            while i < len(pattern) and pattern[i] is None:
+                i += 1
+                out.add(i)
+        return out
+    
+    states = skip_globstars({0})
+    for part in parts:
+        following = set()
+        for i in states:
+            if i == len(pattern):
+                continue
+            if pattern[i] is None:
+                following.add(i)
+            elif pattern[i](part):
+                following.add(i + 1)
+        if not following:
+            return False
+        states = skip_globstars(following)
+    return len(pattern) in states
+
+
+def _iter_search_files(search_path: Path, file_pattern: str):
+    """
+    Yield regular files under search_path whose names match file_pattern
+    As with Path.rglob(), a pattern with directory parts such as 'src/*.py'
+    or 'src/**/*.py' matches component by component, at any depth, with
+    '**' standing for zero or more directories.
+    """
+    segments = file_pattern.replace(os.sep, '/').split('/')
+    pattern = [None if seg == '**' else re.compile(fnmatch.translate(seg)).match for seg in segments]
+    if len(pattern) == 1:
+        name_match, pattern = pattern[0], None
+    else:
+        # rglob() matches at any depth, as if the pattern started with '**/'
+        pattern.insert(0, None)
+        name_match = pattern[-1]
+    root = str(search_path)
+    prefix_len = len(os.path.join(root, ''))
+    blocked_names = security._blocked_names
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                # DirEntry caches the d_type bits, so these checks need no stat()
+                if entry.is_dir(follow_symlinks=False):
+                    # Prune blocked directories (.git, node_modules, ...) before descending
+                    if entry.name not in blocked_names:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    # Symlinks are skipped: they may point outside the root
+                    if name_match is not None and not name_match(entry.name):
+                        continue
+                    if pattern and not _match_components(pattern, entry.path[prefix_len:].split(os.sep)):
+                        continue
+                    if security._fast_check((entry.name,), os.path.splitext(entry.name)[1]):
+                        yield entry.path
+
+
 @mcp.tool(
     title="Search in Files",
     description="Search for text across multiple files using glob patterns. Returns up to 50 matches with line numbers. Case-insensitive search.",
@@ -505,6 +1096,7 @@ def move_file(source: str, destination: str) -> str:
         idempotentHint=True
     )
 )
+@_in_thread
 def search_in_files(search_term: str, directory: str = ".", file_pattern: str = "*.py") -> str:
     """Search for a term in files (read-only)
 
@@ -513,37 +1105,57 @@ def search_in_files(search_term: str, directory: str = ".", file_pattern: str =
         directory: Directory to search in
         file_pattern: File pattern (e.g., *.py, *.js)
     """
-    allowed, reason = security.is_path_allowed(directory)
+    search_path, allowed, reason = security.check_path(directory)
     if not allowed:
         return f"Access denied: {reason}"
     
+    if file_pattern.replace(os.sep, '/').split('/')[-1] == '**':
+        # As with rglob(), a trailing '**' matches directories only, never files
+        return f"Error: file_pattern must end with a file name pattern (e.g. '{file_pattern}/*.py')"
+    
     try:
-        search_path = Path(directory).resolve()
         results = []
+        # ASCII needles are folded and matched as bytes; anything else needs
+        # Unicode case folding, so it is matched against decoded text
+        if search_term.isascii():
+            needle = search_term.encode('utf-8').lower()
+        else:
+            needle = search_term.casefold()
         
-        for file_path in search_path.rglob(file_pattern):
-            # Check each file individually
-            file_allowed, _ = security.is_path_allowed(str(file_path))
-            if not file_allowed:
-                continue
-                
-            if file_path.is_file():
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                        for i, line in enumerate(lines, 1):
-                            if search_term.lower() in line.lower():
-                                rel_path = file_path.relative_to(search_path)
-                                results.append(f"{rel_path}:{i}: {line.strip()}")
-                except:
-                    continue
+        def scan_one(file_path: str) -> list[tuple[int, str]]:
+            try:
+                # One hit past the cap tells us whether to report "more"
+                return _scan_file(file_path, needle, MAX_SEARCH_RESULTS + 1, security.max_file_size)
+            except Exception:
+                return []
+        
+        def collect(file_path: str, future) -> bool:
+            """Add one file's hits to results; True once past the cap"""
+            hits = future.result()
+            if hits:
+                rel_path = os.path.relpath(file_path, search_path)
+                for i, line in hits:
+                    results.append(f"{rel_path}:{i}: {line}")
+            return len(results) > MAX_SEARCH_RESULTS
+        
+        with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as pool:
+            # Keep a bounded window of scans in flight and consume them in
+            # submission order, so output matches a serial scan and the tree
+            # walk itself stops once the cap is reached
+            pending = deque()
+            for file_path in _iter_search_files(search_path, file_pattern):
+                pending.append((file_path, pool.submit(scan_one, file_path)))
+                if len(pending) >= SEARCH_WORKERS * 2 and collect(*pending.popleft()):
+                    break
+            else:
+                while pending and not collect(*pending.popleft()):
+                    pass
+            pool.shutdown(cancel_futures=True)
         
         if results:
-            count = len(results)
-            limited = results[:50]
-            output = "\n".join(limited)
-            if count > 50:
-                output += f"\n\n... and {count - 50} more results"
+            output = "\n".join(results[:MAX_SEARCH_RESULTS])
+            if len(results) > MAX_SEARCH_RESULTS:
+                output += f"\n\n... more results may exist (showing first {MAX_SEARCH_RESULTS})"
             return output
         
         return f"No matches found for '{search_term}'"
@@ -555,56 +1167,67 @@ def search_in_files(search_term: str, directory: str = ".", file_pattern: str =
 @mcp.resource("security://config")
 def security_config() -> str:
     """Display current security configuration"""
-    config_info = f"""
-Security Configuration:
-======================
-Allowed Root: {security.allowed_root}
-Max File Size: {security.max_file_size / (1024*1024):.1f} MB
+    return security.describe()
 
-Blocked Patterns: {', '.join(security.blocked_patterns[:10])}
-{f"... and {len(security.blocked_patterns) - 10} more" if len(security.blocked_patterns) > 10 else ""}
 
-Allowed Extensions: {', '.join(security.allowed_extensions[:20])}
-{f"... and {len(security.allowed_extensions) - 20} more" if len(security.allowed_extensions) > 20 else ""}
-    """
-    return config_info
+# Clients tend to poll workspace://info; recount the root at most this often
+WORKSPACE_INFO_TTL = 5.0
+_workspace_info_cache: tuple[float, str] | None = None
 
 
 @mcp.resource("workspace://info")
 def workspace_info() -> str:
     """Get information about the current workspace"""
+    global _workspace_info_cache
+    now = time.monotonic()
+    if _workspace_info_cache is not None and now < _workspace_info_cache[0]:
+        return _workspace_info_cache[1]
+    
     try:
-        root = Path(security.allowed_root)
-        items = list(root.iterdir())
-        files = sum(1 for f in items if f.is_file())
-        dirs = sum(1 for d in items if d.is_dir())
+        root = security._allowed_root_resolved
+        files = dirs = 0
+        # scandir reports each entry's type from the directory read itself
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir():
+                    dirs += 1
+                elif entry.is_file():
+                    files += 1
         
-        return f"""
+        info = f"""
 Workspace: {root}
 Files: {files}
 Directories: {dirs}
         """
     except Exception as e:
         return f"Error getting workspace info: {str(e)}"
+    
+    _workspace_info_cache = (now + WORKSPACE_INFO_TTL, info)
+    return info
 
 
-if __name__ == "__main__":
-    print(f"Starting Void Sandboxed Filesystem MCP Server...")
-    print(f"Allowed root: {security.allowed_root}")
-    print(f"Config file: {security.config_path}")
+async def _heartbeat():
+    """Periodic liveness log line to help debug client connections"""
+    while True:
+        await asyncio.sleep(10)
+        log.info("[%s] Server alive", time.strftime('%H:%M:%S'))
 
-    # Right after "Starting Void Sandboxed Filesystem MCP Server..."
-    print("Server is running and waiting for connections...", flush=True)
-    print(f"Process ID: {os.getpid()}", flush=True)
-    sys.stdout.flush()
 
-    # Add periodic heartbeat
-    import threading
-    def heartbeat():
-        while True:
-            print(f"[{time.strftime('%H:%M:%S')}] Server alive", flush=True)
-            time.sleep(10)
-        
-    threading.Thread(target=heartbeat, daemon=True).start()
-    
-    mcp.run()
\ No newline at end of file
+async def _serve():
+    """Run the stdio server with the heartbeat as a task on the same event loop"""
+    heartbeat = asyncio.create_task(_heartbeat())
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        heartbeat.cancel()
+
+
+if __name__ == "__main__":
+    # stdout carries the JSON-RPC stream, so startup info goes to stderr
+    log.info("Starting Void Sandboxed Filesystem MCP Server...")
+    log.info(f"Allowed root: {security.allowed_root}")
+    log.info(f"Config file: {security.config_path}")
+    log.info("Server is running and waiting for connections...")
+    log.info(f"Process ID: {os.getpid()}")
+
+    asyncio.run(_serve())
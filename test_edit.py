@@ -3,11 +3,15 @@
 Test script for edit_file tool
 """
 
+import os
 import sys
+import asyncio
 from pathlib import Path
 
 # Import the server
-from mcp_server import edit_file, create_file, read_file, delete_file
+import mcp_server
+from tool_testing import edit_file, create_file, read_file, delete_file, write_file
+
 
 def test_basic_edit():
     """Test 1: Basic single replacement"""
@@ -162,6 +166,70 @@ def test_file_not_found():
     print(f"  Result: {result}")
     print("  ✓ PASSED")
 
+def test_non_utf8_refused():
+    """Test 9: Non-UTF-8 files are refused, not re-encoded piecemeal"""
+    print("\nTest 9: Non-UTF-8 file...")
+
+    original = b"caf\xe9 foo\n"
+    Path("test_latin1.txt").write_bytes(original)
+
+    try:
+        result = edit_file("test_latin1.txt", "foo", "na\u00efve")
+        print(f"  Result: {result}")
+        assert "unsupported encoding" in result, f"Expected encoding error, got: {result}"
+        content = Path("test_latin1.txt").read_bytes()
+        assert content == original, f"Expected file untouched, got: {content!r}"
+        print("  ✓ PASSED")
+    finally:
+        delete_file("test_latin1.txt")
+
+def test_read_only_refused():
+    """Test 10: Read-only files are not replaced behind their permissions"""
+    print("\nTest 10: Read-only file...")
+
+    path = Path("test_readonly.txt")
+    path.write_text("locked = 1\n")
+    path.chmod(0o444)
+    try:
+        if os.access(path, os.W_OK):
+            print("  - SKIPPED (running with permission to ignore file modes)")
+            return
+        result = edit_file("test_readonly.txt", "locked = 1", "locked = 2")
+        print(f"  edit_file: {result}")
+        assert "Permission denied" in result, f"Expected permission error, got: {result}"
+        result = write_file("test_readonly.txt", "locked = 3\n")
+        print(f"  write_file: {result}")
+        assert "Permission denied" in result, f"Expected permission error, got: {result}"
+        assert path.read_text() == "locked = 1\n", f"Expected file untouched, got: {path.read_text()!r}"
+        print("  ✓ PASSED")
+    finally:
+        path.chmod(0o644)
+        path.unlink()
+
+def test_concurrent_edits():
+    """Test 11: Parallel edits to one file are all kept"""
+    print("\nTest 11: Concurrent edits...")
+
+    count = 20
+    create_file("test_concurrent.txt", "".join(f"line_{i} = 0\n" for i in range(count)))
+
+    async def edit_all():
+        return await asyncio.gather(*(
+            mcp_server.edit_file("test_concurrent.txt", f"line_{i} = 0", f"line_{i} = 1")
+            for i in range(count)
+        ))
+
+    try:
+        results = asyncio.run(edit_all())
+        assert all("Successfully replaced" in r for r in results), f"Unexpected results: {results}"
+        content = read_file("test_concurrent.txt")
+        kept = sum(f"line_{i} = 1" in content for i in range(count))
+        print(f"  Edits kept: {kept}/{count}")
+        assert kept == count, f"Expected all {count} edits kept, got {kept}"
+        print("  ✓ PASSED")
+    finally:
+        delete_file("test_concurrent.txt")
+
 def main():
     print("=" * 60)
     print("Testing edit_file tool")
@@ -176,6 +244,9 @@ def main():
         test_indentation_preserved()
         test_more_context_for_uniqueness()
         test_file_not_found()
+        test_non_utf8_refused()
+        test_read_only_refused()
+        test_concurrent_edits()
 
         print("\n" + "=" * 60)
         print("All tests PASSED! ✓")
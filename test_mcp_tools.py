@@ -5,112 +5,90 @@ This script tests the server can start and tools are registered properly.
 """
 
 import sys
-import json
-from pathlib import Path
+
+import pytest
+
+EXPECTED_TOOLS = {
+    "read_file",
+    "write_file",
+    "create_file",
+    "delete_file",
+    "edit_file",
+    "list_directory",
+    "create_directory",
+    "move_file",
+    "search_in_files",
+}
+
+
+def _tool_registry(mcp):
+    """Map tool name -> registered Tool (FastMCP keeps them in its tool manager)"""
+    return {tool.name: tool for tool in mcp._tool_manager.list_tools()}
+
+
+@pytest.fixture(scope="session")
+def mcp():
+    """The server instance, imported once for the whole session"""
+    from mcp_server import mcp
+    return mcp
+
+
+@pytest.fixture(scope="session")
+def tools(mcp):
+    return _tool_registry(mcp)
+
 
 def test_import():
     """Test that the server can be imported without errors"""
     print("1. Testing server import...")
-    try:
-        from mcp_server import mcp, security
-        print("   ✓ Server imported successfully")
-        print(f"   ✓ Server name: {mcp.name}")
-        print(f"   ✓ Allowed root: {security.allowed_root}")
-        return mcp
-    except Exception as e:
-        print(f"   ✗ Import failed: {e}")
-        sys.exit(1)
+    from mcp_server import mcp, security
+    print("   ✓ Server imported successfully")
+    print(f"   ✓ Server name: {mcp.name}")
+    print(f"   ✓ Allowed root: {security.allowed_root}")
 
-def test_tools_registered(mcp):
+def test_tools_registered(tools):
     """Test that all expected tools are registered"""
     print("\n2. Testing tool registration...")
 
-    expected_tools = [
-        "read_file",
-        "write_file",
-        "create_file",
-        "delete_file",
-        "list_directory",
-        "create_directory",
-        "move_file",
-        "search_in_files"
-    ]
-
-    try:
-        # Access the internal tools registry
-        if hasattr(mcp, '_tools'):
-            registered = list(mcp._tools.keys())
-            print(f"   ✓ Found {len(registered)} registered tools")
-
-            for tool_name in expected_tools:
-                if tool_name in registered:
-                    print(f"   ✓ {tool_name}")
-                else:
-                    print(f"   ✗ {tool_name} - NOT FOUND")
-
-            # Check for unexpected tools
-            extra = set(registered) - set(expected_tools)
-            if extra:
-                print(f"   ! Extra tools found: {extra}")
-
-            return True
-        else:
-            print("   ! Cannot access internal tool registry")
-            return False
+    print(f"   ✓ Found {len(tools)} registered tools")
+    missing = EXPECTED_TOOLS - tools.keys()
+    assert not missing, f"Tools not registered: {sorted(missing)}"
 
-    except Exception as e:
-        print(f"   ✗ Tool registration check failed: {e}")
-        return False
+    # Check for unexpected tools
+    extra = tools.keys() - EXPECTED_TOOLS
+    if extra:
+        print(f"   ! Extra tools found: {extra}")
 
-def test_tool_metadata(mcp):
+def test_tool_metadata(tools):
     """Test that tools have proper metadata"""
     print("\n3. Testing tool metadata...")
 
-    try:
-        if hasattr(mcp, '_tools'):
-            tools = mcp._tools
-
-            # Check a sample tool for metadata
-            sample_tools = ["read_file", "write_file", "delete_file"]
-
-            for tool_name in sample_tools:
-                if tool_name in tools:
-                    tool = tools[tool_name]
-                    print(f"\n   {tool_name}:")
-
-                    # Check if tool has callable function
-                    if callable(tool):
-                        print(f"     ✓ Is callable")
-                    else:
-                        print(f"     ✗ Not callable")
-
-                    # Check for annotations (if accessible)
-                    if hasattr(tool, '__name__'):
-                        print(f"     ✓ Function name: {tool.__name__}")
-
-                    if hasattr(tool, '__doc__'):
-                        doc = tool.__doc__
-                        if doc:
-                            first_line = doc.strip().split('\n')[0]
-                            print(f"     ✓ Docstring: {first_line[:60]}...")
-                        else:
-                            print(f"     ! No docstring")
-
-            return True
-        else:
-            print("   ! Cannot access tool metadata")
-            return False
+    # Check a sample tool for metadata
+    sample_tools = ["read_file", "write_file", "delete_file"]
 
-    except Exception as e:
-        print(f"   ✗ Metadata check failed: {e}")
-        return False
+    for tool_name in sample_tools:
+        tool = tools[tool_name].fn
+        print(f"\n   {tool_name}:")
+
+        # Check if tool has callable function
+        assert callable(tool), f"{tool_name} is not callable"
+        print(f"     ✓ Is callable")
+
+        # Functions always carry __name__ and __doc__, so read them directly
+        assert tool.__name__ == tool_name, f"Unexpected function name: {tool.__name__}"
+        print(f"     ✓ Function name: {tool.__name__}")
+
+        doc = tool.__doc__
+        assert doc, f"{tool_name} has no docstring"
+        first_line = doc.strip().split('\n')[0]
+        print(f"     ✓ Docstring: {first_line[:60]}...")
 
 def test_security_config():
     """Test security configuration is loaded"""
     print("\n4. Testing security configuration...")
 
     try:
-        from void_mcp_server import security
+        from mcp_server import security
 
         print(f"   ✓ Allowed root: {security.allowed_root}")
         print(f"   ✓ Max file size: {security.max_file_size / (1024*1024):.1f} MB")
@@ -122,14 +100,12 @@ def test_security_config():
         allowed, reason = security.is_path_allowed(test_path)
         print(f"\n   Test path validation for '{test_path}':")
         print(f"     {'✓' if allowed else '✗'} {reason}")
-
-        return True
+        assert allowed, f"Expected '{test_path}' allowed, got: {reason}"
 
     except Exception as e:
-        print(f"   ✗ Security config check failed: {e}")
-        return False
+        pytest.fail(f"Security config check failed: {e}")
 
-def test_tool_schemas(mcp):
+def test_tool_schemas(mcp, tools):
     """Test that tools can generate proper JSON schemas"""
     print("\n5. Testing tool schema generation...")
 
@@ -138,39 +114,36 @@ def test_tool_schemas(mcp):
         # and generate proper MCP tool schemas
 
         # Try to simulate what MCP does when listing tools
-        if hasattr(mcp, 'list_tools'):
-            print("   ✓ Server has list_tools method")
-
-        if hasattr(mcp, '_tools'):
-            print(f"   ✓ Can access {len(mcp._tools)} tool definitions")
-
-            # Check if we can get function signatures
-            from inspect import signature
-
-            sample = "read_file"
-            if sample in mcp._tools:
-                func = mcp._tools[sample]
-                sig = signature(func)
-                print(f"\n   {sample} signature: {sig}")
-                print(f"     ✓ Parameters: {list(sig.parameters.keys())}")
-
-                for param_name, param in sig.parameters.items():
-                    annotation = param.annotation
-                    if annotation != param.empty:
-                        print(f"       - {param_name}: {annotation}")
-
-        return True
+        list_tools = getattr(mcp, 'list_tools', None)
+        assert callable(list_tools), "Server has no list_tools method"
+        print("   ✓ Server has list_tools method")
+
+        print(f"   ✓ Can access {len(tools)} tool definitions")
+
+        # FastMCP builds each tool's argument model once at registration;
+        # read the schema it produced rather than re-inspecting signatures
+        for name, tool in sorted(tools.items()):
+            schema = tool.parameters
+            assert schema.get("type") == "object", f"{name}: unexpected schema {schema}"
+            properties = schema.get("properties", {})
+            for required in schema.get("required", []):
+                assert required in properties, f"{name}: required '{required}' not in properties"
+            params = ", ".join(f"{param}: {spec.get('type')}" for param, spec in properties.items())
+            print(f"\n   {name}: {params}")
+
+        # Schemas must come out unchanged through the shared tool decorators
+        read_schema = tools["read_file"].parameters
+        assert read_schema["required"] == ["path"], f"Unexpected read_file schema: {read_schema}"
+        assert read_schema["properties"]["path"]["type"] == "string"
 
     except Exception as e:
-        print(f"   ✗ Schema generation check failed: {e}")
-        return False
+        pytest.fail(f"Schema generation check failed: {e}")
 
 def test_annotations():
     """Test that tool annotations are properly configured"""
     print("\n6. Testing tool annotations...")
 
     try:
-        from void_mcp_server import mcp
         from mcp.types import ToolAnnotations
 
         print("   ✓ ToolAnnotations imported successfully")
@@ -182,11 +155,8 @@ def test_annotations():
         )
         print(f"   ✓ Can create ToolAnnotations: {test_annotation}")
 
-        return True
-
     except Exception as e:
-        print(f"   ✗ Annotations check failed: {e}")
-        return False
+        pytest.fail(f"Annotations check failed: {e}")
 
 def main():
     """Run all tests"""
@@ -194,13 +164,19 @@ def main():
     print("MCP Server Tool Testing")
     print("=" * 60)
 
-    # Run tests
-    mcp = test_import()
-    test_tools_registered(mcp)
-    test_tool_metadata(mcp)
-    test_security_config()
-    test_tool_schemas(mcp)
-    test_annotations()
+    # Run tests (pytest runs the same functions with session fixtures)
+    test_import()
+    from mcp_server import mcp
+    tools = _tool_registry(mcp)
+    try:
+        test_tools_registered(tools)
+        test_tool_metadata(tools)
+        test_security_config()
+        test_tool_schemas(mcp, tools)
+        test_annotations()
+    except (AssertionError, pytest.fail.Exception) as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        sys.exit(1)
 
     print("\n" + "=" * 60)
     print("Testing complete!")
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Test script for search_in_files tool
+"""
+
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+# Import the server
+import mcp_server
+from mcp_server import MAX_SEARCH_RESULTS
+from tool_testing import search_in_files, create_file
+
+SEARCH_DIR = "test_search_tmp"
+
+
+def setup_module(module=None):
+    shutil.rmtree(SEARCH_DIR, ignore_errors=True)
+
+
+def teardown_module(module=None):
+    shutil.rmtree(SEARCH_DIR, ignore_errors=True)
+
+
+def test_basic_search():
+    """Test 1: Case-insensitive match with line numbers"""
+    print("Test 1: Basic search...")
+
+    create_file(f"{SEARCH_DIR}/basic.py", "x = 1\nVALUE = 2\nvalue = 3\n")
+    result = search_in_files("value", SEARCH_DIR, "*.py")
+
+    print(f"  Result: {result}")
+    assert "basic.py:2: VALUE = 2" in result, f"Expected line 2 match, got: {result}"
+    assert "basic.py:3: value = 3" in result, f"Expected line 3 match, got: {result}"
+    assert "basic.py:1" not in result, f"Did not expect line 1 match, got: {result}"
+    print("  ✓ PASSED")
+
+
+def test_result_cap():
+    """Test 2: Search stops at the result cap"""
+    print("\nTest 2: Result cap...")
+
+    lines = "".join(f"needle {i}\n" for i in range(MAX_SEARCH_RESULTS * 2))
+    create_file(f"{SEARCH_DIR}/many_a.txt", lines)
+    create_file(f"{SEARCH_DIR}/many_b.txt", lines)
+    result = search_in_files("needle", SEARCH_DIR, "*.txt")
+
+    matches = [line for line in result.splitlines() if ": needle" in line]
+    assert len(matches) == MAX_SEARCH_RESULTS, f"Expected {MAX_SEARCH_RESULTS} matches, got {len(matches)}"
+    assert "more results may exist" in result, f"Expected truncation note, got: {result[-200:]}"
+    print("  ✓ PASSED")
+
+
+def test_no_matches():
+    """Test 3: No matches"""
+    print("\nTest 3: No matches...")
+
+    create_file(f"{SEARCH_DIR}/empty.py", "")
+    result = search_in_files("zzz_not_there", SEARCH_DIR, "*.py")
+
+    assert result.startswith("No matches found"), f"Expected no matches, got: {result}"
+    print("  ✓ PASSED")
+
+
+def test_blocked_dirs_skipped():
+    """Test 4: Blocked directories are not searched"""
+    print("\nTest 4: Blocked directories skipped...")
+
+    # create_file refuses blocked paths, so plant the file directly
+    blocked = Path(SEARCH_DIR) / "node_modules"
+    blocked.mkdir(parents=True, exist_ok=True)
+    (blocked / "hidden.py").write_text("secret_marker = 1\n")
+    # Blocked extension with no stem, so it has no suffix of its own
+    (Path(SEARCH_DIR) / ".pem").write_text("secret_marker = 3\n")
+    create_file(f"{SEARCH_DIR}/visible.py", "secret_marker = 2\n")
+
+    result = search_in_files("secret_marker", SEARCH_DIR, "*")
+
+    print(f"  Result: {result}")
+    assert "visible.py:1" in result, f"Expected visible.py match, got: {result}"
+    assert "node_modules" not in result, f"Expected node_modules skipped, got: {result}"
+    assert ".pem" not in result, f"Expected .pem skipped, got: {result}"
+    print("  ✓ PASSED")
+
+
+def test_symlinks_skipped():
+    """Test 5: Symlinks pointing outside the root are not followed"""
+    print("\nTest 5: Symlinks skipped...")
+
+    outside = Path(tempfile.mkdtemp()) / "outside.txt"
+    outside.write_text("escaped_marker\n")
+    link = Path(SEARCH_DIR) / "link.txt"
+    link.parent.mkdir(parents=True, exist_ok=True)
+    link.symlink_to(outside)
+
+    try:
+        result = search_in_files("escaped_marker", SEARCH_DIR, "*.txt")
+    finally:
+        shutil.rmtree(outside.parent, ignore_errors=True)
+
+    print(f"  Result: {result}")
+    assert result.startswith("No matches found"), f"Expected symlink skipped, got: {result}"
+    print("  ✓ PASSED")
+
+
+def test_undecodable_bytes():
+    """Test 6: Invalid UTF-8 on other lines does not hide matches"""
+    print("\nTest 6: Undecodable bytes...")
+
+    # Only matching lines are decoded, so stray bytes elsewhere are harmless
+    raw = Path(SEARCH_DIR) / "latin1.txt"
+    raw.parent.mkdir(parents=True, exist_ok=True)
+    raw.write_bytes(b"caf\xe9 au lait\r\nbyte_marker \xff here\r\nna\xc3\xafve\r\n")
+    result = search_in_files("byte_marker", SEARCH_DIR, "*.txt")
+
+    print(f"  Result: {result}")
+    assert "latin1.txt:2: byte_marker \ufffd here" in result, f"Expected line 2 match, got: {result}"
+    print("  ✓ PASSED")
+
+
+def test_path_pattern():
+    """Test 7: Patterns with a directory part match trailing components"""
+    print("\nTest 7: Path patterns...")
+
+    create_file(f"{SEARCH_DIR}/pkg/sub/inner.py", "path_marker\n")
+    create_file(f"{SEARCH_DIR}/pkg/outer.py", "path_marker\n")
+    create_file(f"{SEARCH_DIR}/pkg/sub/deeper/leaf.py", "path_marker\n")
+
+    for pattern in ["sub/*.py", "**/sub/*.py"]:
+        result = search_in_files("path_marker", SEARCH_DIR, pattern)
+        print(f"  {pattern!r}: {result}")
+        assert "inner.py:1" in result, f"Expected inner.py match, got: {result}"
+        assert "outer.py" not in result, f"Did not expect outer.py, got: {result}"
+        assert "leaf.py" not in result, f"Did not expect leaf.py, got: {result}"
+
+    # '**' inside the pattern spans zero or more directories
+    result = search_in_files("path_marker", SEARCH_DIR, "sub/**/*.py")
+    print(f"  'sub/**/*.py': {result}")
+    assert "inner.py:1" in result, f"Expected inner.py match, got: {result}"
+    assert "leaf.py:1" in result, f"Expected leaf.py match, got: {result}"
+    assert "outer.py" not in result, f"Did not expect outer.py, got: {result}"
+
+    result = search_in_files("path_marker", SEARCH_DIR, "sub/**")
+    assert result.startswith("Error: file_pattern must end"), f"Expected pattern error, got: {result}"
+    print("  ✓ PASSED")
+
+
+def test_oversized_skipped():
+    """Test 8: Files over the size limit are not searched"""
+    print("\nTest 8: Oversized files skipped...")
+
+    create_file(f"{SEARCH_DIR}/small.md", "size_marker\n")
+    create_file(f"{SEARCH_DIR}/large.md", "size_marker\n" + "x" * 100)
+
+    saved = mcp_server.security.max_file_size
+    mcp_server.security.max_file_size = 50
+    try:
+        result = search_in_files("size_marker", SEARCH_DIR, "*.md")
+    finally:
+        mcp_server.security.max_file_size = saved
+
+    print(f"  Result: {result}")
+    assert "small.md:1" in result, f"Expected small.md match, got: {result}"
+    assert "large.md" not in result, f"Expected large.md skipped, got: {result}"
+    print("  ✓ PASSED")
+
+
+def test_cr_line_endings():
+    """Test 9: CR-only files report the same line numbers as read_file"""
+    print("\nTest 9: CR line endings...")
+
+    raw = Path(SEARCH_DIR) / "classic_mac.txt"
+    raw.parent.mkdir(parents=True, exist_ok=True)
+    raw.write_bytes(b"first\rsecond\rcr_marker third\r")
+    result = search_in_files("cr_marker", SEARCH_DIR, "*.txt")
+
+    print(f"  Result: {result!r}")
+    assert "classic_mac.txt:3: cr_marker third" in result, f"Expected line 3 match, got: {result!r}"
+    assert "\r" not in result, f"Expected no raw CR in output, got: {result!r}"
+    print("  ✓ PASSED")
+
+
+def test_non_ascii_case_insensitive():
+    """Test 10: Non-ASCII letters match regardless of case"""
+    print("\nTest 10: Non-ASCII case folding...")
+
+    create_file(f"{SEARCH_DIR}/accents.md", "plain line\nCAFÉ CRÈME\ncafé crème\n")
+    result = search_in_files("Café", SEARCH_DIR, "*.md")
+
+    print(f"  Result: {result}")
+    assert "accents.md:2: CAFÉ CRÈME" in result, f"Expected line 2 match, got: {result}"
+    assert "accents.md:3: café crème" in result, f"Expected line 3 match, got: {result}"
+    assert "accents.md:1" not in result, f"Did not expect line 1 match, got: {result}"
+    print("  ✓ PASSED")
+
+
+def main():
+    print("=" * 60)
+    print("Testing search_in_files tool")
+    print("=" * 60)
+
+    setup_module()
+    try:
+        test_basic_search()
+        test_result_cap()
+        test_no_matches()
+        test_blocked_dirs_skipped()
+        test_symlinks_skipped()
+        test_undecodable_bytes()
+        test_path_pattern()
+        test_oversized_skipped()
+        test_cr_line_endings()
+        test_non_ascii_case_insensitive()
+
+        print("\n" + "=" * 60)
+        print("All tests PASSED! ✓")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        teardown_module()
+
+if __name__ == "__main__":
+    main()
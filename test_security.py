@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Test script for SecurityConfig path validation
+"""
+
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Import the server
+from mcp_server import security, SecurityConfig
+from tool_testing import read_file, list_directory
+
+
+def test_inside_root():
+    """Test 1: Paths inside the root are allowed"""
+    print("Test 1: Paths inside the root...")
+
+    for path in [".", "test.py", "sub/dir/test.py", security.allowed_root]:
+        allowed, reason = security.is_path_allowed(path)
+        print(f"  {path!r}: {reason}")
+        assert allowed, f"Expected {path!r} allowed, got: {reason}"
+    print("  ✓ PASSED")
+
+
+def test_outside_root():
+    """Test 2: Traversal and sibling directories are denied"""
+    print("\nTest 2: Paths outside the root...")
+
+    root = Path(security.allowed_root).resolve()
+    sibling = str(root) + "_sibling/test.py"
+    for path in ["../test.py", "/etc/passwd", sibling]:
+        allowed, reason = security.is_path_allowed(path)
+        print(f"  {path!r}: {reason}")
+        assert not allowed, f"Expected {path!r} denied"
+        assert "outside allowed directory" in reason, f"Unexpected reason: {reason}"
+    print("  ✓ PASSED")
+
+
+def test_blocked_patterns():
+    """Test 3: Blocked names and extensions are denied"""
+    print("\nTest 3: Blocked patterns...")
+
+    cases = {
+        ".git/config": "Blocked pattern: .git",
+        "src/node_modules/pkg/index.js": "Blocked pattern: node_modules",
+        "certs/server.pem": "Blocked file extension: *.pem",
+        "certs/SERVER.KEY": "Blocked file extension: *.key",
+    }
+    for path, expected in cases.items():
+        allowed, reason = security.is_path_allowed(path)
+        print(f"  {path!r}: {reason}")
+        assert not allowed and reason == expected, f"Expected {expected!r}, got: {reason}"
+    print("  ✓ PASSED")
+
+
+def test_extension_whitelist():
+    """Test 4: Only whitelisted extensions are allowed for files"""
+    print("\nTest 4: Extension whitelist...")
+
+    allowed, reason = security.is_path_allowed("image.png")
+    assert not allowed and "not allowed" in reason, f"Expected .png denied, got: {reason}"
+    allowed, reason = security.is_path_allowed("README.MD")
+    assert allowed, f"Expected case-insensitive .md allowed, got: {reason}"
+    print("  ✓ PASSED")
+
+
+def test_filesystem_root():
+    """Test 5: A root of '/' still contains absolute paths"""
+    print("\nTest 5: Filesystem root as allowed root...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "mcp_config.json"
+        config_path.write_text(json.dumps({"allowed_root": "/"}))
+        config = SecurityConfig(str(config_path))
+
+        # A naive root + os.sep prefix would be '//' and reject everything
+        allowed, reason = config.is_path_allowed(str(Path(tmp) / "test.py"))
+        assert allowed, f"Expected path under '/' allowed, got: {reason}"
+    print("  ✓ PASSED")
+
+
+def test_symlink_escapes():
+    """Test 6: Symlinks are checked by their target as well as their name"""
+    print("\nTest 6: Symlink escapes...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp).resolve()
+        root = base / "root"
+        root.mkdir()
+        (base / "outside.txt").write_text("x")
+        (root / ".env").write_text("x")
+        (root / "real.txt").write_text("x")
+        (root / "escape.txt").symlink_to(base / "outside.txt")
+        (root / "notes.txt").symlink_to(root / ".env")
+        (root / "alias.txt").symlink_to(root / "real.txt")
+
+        config_path = base / "mcp_config.json"
+        config_path.write_text(json.dumps({"allowed_root": str(root)}))
+        config = SecurityConfig(str(config_path))
+
+        allowed, reason = config.is_path_allowed(str(root / "escape.txt"))
+        assert not allowed and "outside allowed directory" in reason, f"Expected escape denied, got: {reason}"
+        allowed, reason = config.is_path_allowed(str(root / "notes.txt"))
+        assert not allowed and "Blocked pattern: .env" in reason, f"Expected link to .env denied, got: {reason}"
+        allowed, reason = config.is_path_allowed(str(root / "alias.txt"))
+        assert allowed, f"Expected link inside root allowed, got: {reason}"
+    print("  ✓ PASSED")
+
+
+def test_reload_invalidates_cache():
+    """Test 7: Reloading the config drops cached verdicts"""
+    print("\nTest 7: Config reload invalidates cache...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp).resolve()
+        config_path = base / "mcp_config.json"
+        config_path.write_text(json.dumps({"allowed_root": str(base)}))
+        config = SecurityConfig(str(config_path))
+
+        target = str(base / "notes.txt")
+        allowed, reason = config.is_path_allowed(target)
+        assert allowed, f"Expected .txt allowed before reload, got: {reason}"
+
+        config_path.write_text(json.dumps({
+            "allowed_root": str(base),
+            "additional_blocked": ["*.txt"],
+        }))
+        config.load_config()
+        allowed, reason = config.is_path_allowed(target)
+        assert not allowed, "Expected stale verdict dropped after reload"
+        assert "Blocked file extension: *.txt" in reason, f"Unexpected reason: {reason}"
+    print("  ✓ PASSED")
+
+
+def test_additional_extensions():
+    """Test 8: Extensions added in the config join the case-insensitive whitelist"""
+    print("\nTest 8: Additional extensions...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp).resolve()
+        config_path = base / "mcp_config.json"
+        config_path.write_text(json.dumps({
+            "allowed_root": str(base),
+            "additional_extensions": [".SQL"],
+        }))
+        config = SecurityConfig(str(config_path))
+
+        for name in ["schema.sql", "SCHEMA.SQL"]:
+            allowed, reason = config.is_path_allowed(str(base / name))
+            assert allowed, f"Expected {name} allowed, got: {reason}"
+        allowed, reason = config.is_path_allowed(str(base / "image.png"))
+        assert not allowed, "Expected .png still denied"
+    print("  ✓ PASSED")
+
+
+def test_unchanged_config_not_reloaded():
+    """Test 9: load_config() is a no-op while the config file is unchanged"""
+    print("\nTest 9: Unchanged config not reloaded...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp).resolve()
+        config_path = base / "mcp_config.json"
+        config_path.write_text(json.dumps({"allowed_root": str(base)}))
+        config = SecurityConfig(str(config_path))
+
+        config.is_path_allowed(str(base / "notes.txt"))
+        config.load_config()
+        cached = config._check_cached.cache_info().currsize
+        assert cached == 1, f"Expected cached verdict kept, cache size {cached}"
+
+        config.load_config(force=True)
+        cached = config._check_cached.cache_info().currsize
+        assert cached == 0, f"Expected forced reload to clear cache, size {cached}"
+    print("  ✓ PASSED")
+
+
+def test_dotdot_through_symlink():
+    """Test 10: '..' after a symlink is judged by the real path, not lexically"""
+    print("\nTest 10: '..' through a symlink...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp).resolve()
+        root = base / "root"
+        (base / "outside" / "sub").mkdir(parents=True)
+        root.mkdir()
+        (root / "link").symlink_to(base / "outside" / "sub")
+        (base / "outside" / "secret.txt").write_text("x")
+
+        config_path = base / "mcp_config.json"
+        config_path.write_text(json.dumps({"allowed_root": str(root)}))
+        config = SecurityConfig(str(config_path))
+
+        # normpath would make this root/secret.txt; the kernel follows the
+        # link first and lands in outside/secret.txt
+        path = str(root / "link" / ".." / "secret.txt")
+        allowed, reason = config.is_path_allowed(path)
+        assert not allowed and "outside allowed directory" in reason, f"Expected denied, got: {reason}"
+    print("  ✓ PASSED")
+
+
+def test_symlinked_root():
+    """Test 11: A root configured through a symlink accepts paths spelled with it"""
+    print("\nTest 11: Symlinked allowed root...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp).resolve()
+        (base / "real").mkdir()
+        (base / "outside.txt").write_text("x")
+        alias = base / "alias"
+        alias.symlink_to(base / "real")
+
+        config_path = base / "mcp_config.json"
+        config_path.write_text(json.dumps({"allowed_root": str(alias)}))
+        config = SecurityConfig(str(config_path))
+
+        for path in [alias / "a.txt", base / "real" / "a.txt"]:
+            allowed, reason = config.is_path_allowed(str(path))
+            assert allowed, f"Expected {path} allowed, got: {reason}"
+        allowed, reason = config.is_path_allowed(str(alias / ".env"))
+        assert not allowed and "Blocked pattern: .env" in reason, f"Expected .env denied, got: {reason}"
+        allowed, reason = config.is_path_allowed(str(alias / ".." / "outside.txt"))
+        assert not allowed and "outside allowed directory" in reason, f"Expected denied, got: {reason}"
+    print("  ✓ PASSED")
+
+
+def test_symlink_swapped_after_check():
+    """Test 12: A file swapped for an outside symlink loses its cached verdict"""
+    print("\nTest 12: Symlink swapped in after a read...")
+
+    target = Path("test_swap.txt")
+    target.write_text("inside\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        secret = Path(tmp).resolve() / "secret.txt"
+        secret.write_text("secret\n")
+        try:
+            result = read_file("test_swap.txt")
+            assert result == "inside\n", f"Expected first read to succeed, got: {result}"
+
+            # Swapped behind the server's back, so nothing calls invalidate()
+            target.unlink()
+            target.symlink_to(secret)
+            result = read_file("test_swap.txt")
+            print(f"  Result: {result}")
+            assert "secret" not in result, "Read followed a symlink swapped in after the first check"
+            assert "outside allowed directory" in result, f"Expected access denied, got: {result}"
+        finally:
+            target.unlink(missing_ok=True)
+    print("  ✓ PASSED")
+
+
+def test_directory_replaced_by_file():
+    """Test 13: A directory swapped for a file is checked against the whitelist"""
+    print("\nTest 13: Directory replaced by a file...")
+
+    target = Path("test_swap.bin")
+    target.mkdir()
+    try:
+        # Directories are exempt from the extension whitelist
+        result = list_directory("test_swap.bin")
+        assert result.startswith("Directory:"), f"Expected listing, got: {result}"
+
+        # Replaced behind the server's back, so nothing calls invalidate()
+        target.rmdir()
+        target.write_bytes(b"binary payload\n")
+        result = read_file("test_swap.bin")
+        print(f"  Result: {result}")
+        assert "File extension not allowed: .bin" in result, f"Expected whitelist denial, got: {result}"
+    finally:
+        if target.is_dir():
+            target.rmdir()
+        else:
+            target.unlink(missing_ok=True)
+    print("  ✓ PASSED")
+
+
+def test_reload_failures():
+    """Test 14: A broken reload keeps the rules; a deleted config resets the root"""
+    print("\nTest 14: Config reload failures...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp).resolve()
+        config_path = base / "mcp_config.json"
+        config_path.write_text(json.dumps({
+            "allowed_root": str(base),
+            "additional_blocked": ["*.txt"],
+        }))
+        config = SecurityConfig(str(config_path))
+        target = str(base / "notes.txt")
+
+        # Half-saved file: the *.txt rule must survive the failed reload
+        config_path.write_text('{"allowed_root": "/", "additional_blo')
+        config.load_config()
+        allowed, reason = config.is_path_allowed(target)
+        assert not allowed and "*.txt" in reason, f"Expected rule kept, got: {reason}"
+        assert config.allowed_root == str(base), f"Expected root kept, got: {config.allowed_root}"
+
+        # Deleted file: back to the defaults, with the root at the cwd
+        config_path.unlink()
+        config.load_config()
+        assert config.allowed_root == str(Path.cwd()), f"Expected cwd root, got: {config.allowed_root}"
+        assert "*.txt" not in config.blocked_patterns, f"Expected default rules, got: {config.blocked_patterns}"
+    print("  ✓ PASSED")
+
+
+def main():
+    print("=" * 60)
+    print("Testing SecurityConfig path validation")
+    print("=" * 60)
+
+    try:
+        test_inside_root()
+        test_outside_root()
+        test_blocked_patterns()
+        test_extension_whitelist()
+        test_filesystem_root()
+        test_symlink_escapes()
+        test_reload_invalidates_cache()
+        test_additional_extensions()
+        test_unchanged_config_not_reloaded()
+        test_dotdot_through_symlink()
+        test_symlinked_root()
+        test_symlink_swapped_after_check()
+        test_directory_replaced_by_file()
+        test_reload_failures()
+
+        print("\n" + "=" * 60)
+        print("All tests PASSED! ✓")
+        print("=" * 60)
+
+    except AssertionError as e:
+        print(f"\n✗ TEST FAILED: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ UNEXPECTED ERROR: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Shared helpers for the test scripts
+"""
+
+import asyncio
+
+import mcp_server
+
+
+def sync(tool):
+    """Tools are coroutines; run each call to completion for these tests"""
+    return lambda *args, **kwargs: asyncio.run(tool(*args, **kwargs))
+
+
+# The tools the test scripts call directly, as plain blocking functions
+read_file = sync(mcp_server.read_file)
+write_file = sync(mcp_server.write_file)
+create_file = sync(mcp_server.create_file)
+delete_file = sync(mcp_server.delete_file)
+edit_file = sync(mcp_server.edit_file)
+list_directory = sync(mcp_server.list_directory)
+search_in_files = sync(mcp_server.search_in_files)